@@ -1,28 +1,129 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Optional
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from app.core.models import SearchResponse, CompanyResult
+from app.core.config import settings
+from app.core.models import SearchResponse, BatchSearchRequest, BatchSearchResponse
 from app.services.search import SearchService
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# Create a single global instance of SearchService
+# Serialize responses with orjson when it is installed
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# Create a single global instance of SearchService (initialized in the background)
 search_service_instance = SearchService()
 
-# Dependency to get the search service instance
-def get_search_service():
+# Background initialization of the search service; started at application startup, or by
+# the first search request if the startup hook never ran (e.g. the router is mounted elsewhere)
+_search_service_init: Optional[Future] = None
+_search_service_init_lock = threading.Lock()
+
+# Thread pool running searches so embedding and vector queries don't block the event loop
+search_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_WORKERS or os.cpu_count(),
+    thread_name_prefix="search"
+)
+
+def _initialize_search_service():
     """
-    Dependency for getting the search service instance.
-    Returns the singleton instance rather than creating a new one each time.
+    Connect the search service to the vector database and preload its components.
+    Blocking; run in a worker thread so the event loop stays free.
     """
+    search_service_instance.initialize()
+    search_service_instance.preload_all_components()
+
+def _log_search_service_initialization(future: Future):
+    """
+    Log the outcome of the background initialization of the search service.
+    """
+    error = future.exception()
+    if error is None:
+        logger.info("All services initialized and ready")
+    else:
+        logger.error(f"Error initializing search service: {str(error)}", exc_info=error)
+
+def initialize_search_service() -> Future:
+    """
+    Start initializing the search service in a background thread, unless already started.
+    Called at application startup so the server can accept connections immediately.
+    The returned future is not tied to an event loop, so it can be awaited from any loop.
+    
+    Returns:
+        Future that completes once the search service is initialized.
+    """
+    global _search_service_init
+    with _search_service_init_lock:
+        if _search_service_init is None:
+            _search_service_init = search_executor.submit(_initialize_search_service)
+            _search_service_init.add_done_callback(_log_search_service_initialization)
+        return _search_service_init
+
+def is_search_service_ready() -> bool:
+    """
+    Check whether the search service has finished initializing successfully.
+    """
+    init = _search_service_init
+    return init is not None and init.done() and init.exception() is None
+
+async def get_search_service() -> SearchService:
+    """
+    Get the search service instance.
+    Returns the singleton instance rather than creating a new one each time,
+    waiting for background initialization to complete first (and starting it if
+    it wasn't started at startup). Called directly by the routes instead of through
+    Depends to keep dependency resolution off the hot path.
+    """
+    init = initialize_search_service()
+    if not init.done():
+        # asyncio.wait doesn't raise the initialization error (handled below) and doesn't
+        # cancel the shared initialization if this request is cancelled
+        await asyncio.wait((asyncio.wrap_future(init),))
+    if init.exception() is not None:
+        raise HTTPException(status_code=503, detail="Search service failed to initialize")
     return search_service_instance
 
-@router.get("/search", response_model=SearchResponse)
+def prepare_query(query: str) -> str:
+    """
+    Normalize a query before embedding it.
+    Strips surrounding whitespace and truncates it to MAX_QUERY_CHARS, since the
+    embedding model only looks at a bounded number of tokens anyway.
+    
+    Raises:
+        HTTPException: If the query is empty after stripping.
+    """
+    prepared = query.strip()[:settings.MAX_QUERY_CHARS]
+    if not prepared:
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    return prepared
+
+@router.get("/search", response_model=SearchResponse, response_class=DefaultResponse)
 async def search_companies(
-    query: str = Query(..., description="Search query string"),
-    limit: Optional[int] = Query(5, description="Maximum number of results to return"),
-    sector: Optional[str] = Query(None, description="Filter results by sector"),
-    search_service: SearchService = Depends(get_search_service)
+    query: str = Query(
+        ...,
+        min_length=1,
+        max_length=settings.MAX_QUERY_LENGTH,
+        description="Search query string"
+    ),
+    limit: int = Query(
+        settings.DEFAULT_RESULTS_LIMIT,
+        ge=1,
+        le=settings.MAX_RESULTS_LIMIT,
+        description="Maximum number of results to return"
+    ),
+    sector: Optional[str] = Query(None, description="Filter results by sector")
 ):
     """
     Search for companies using semantic search.
@@ -35,16 +136,73 @@ async def search_companies(
     - Search for banking: `/search?query=banking`
     - Search for Tesla: `/search?query=TSLA`
     """
+    # Reject empty queries before doing any work
+    search_query = prepare_query(query)
+    search_service = await get_search_service()
+    
     try:
-        # Call the search service to find matching companies
-        results = search_service.search(query, limit=limit, sector=sector)
+        # Call the search service on the search thread pool to find matching companies
+        results = await asyncio.get_running_loop().run_in_executor(
+            search_executor,
+            lambda: search_service.search(search_query, limit=limit, sector=sector)
+        )
         
-        # Return the search response
-        return SearchResponse(
-            results=results,
-            count=len(results),
-            query=query
+        # Return the search response; results are already plain dictionaries, so
+        # they are serialized directly without re-validating them against the model
+        return DefaultResponse({
+            "results": results,
+            "count": len(results),
+            "query": query
+        })
+    except Exception as e:
+        # Log the error
+        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}") 
+
+@router.post("/search/batch", response_model=BatchSearchResponse, response_class=DefaultResponse)
+async def search_companies_batch(
+    request: BatchSearchRequest
+):
+    """
+    Search for companies using several queries in one request.
+    
+    All queries are embedded together in a single batch, which is much cheaper
+    than issuing one `/search` request per query. Results are returned in the
+    same order as the queries.
+    
+    Example body:
+    `{"queries": ["AI", "banking", "TSLA"], "limit": 5}`
+    """
+    # Reject empty queries before doing any work
+    search_queries = [prepare_query(query) for query in request.queries]
+    search_service = await get_search_service()
+    
+    try:
+        # Call the search service on the search thread pool to find matching companies
+        batch_results = await asyncio.get_running_loop().run_in_executor(
+            search_executor,
+            lambda: search_service.search_batch(search_queries, limit=request.limit, sector=request.sector)
         )
+        
+        # Return one search response per query
+        responses = [
+            {"results": results, "count": len(results), "query": query}
+            for query, results in zip(request.queries, batch_results)
+        ]
+        return DefaultResponse({"results": responses, "count": len(responses)})
     except Exception as e:
         # Log the error
-        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
+
+@router.get("/search/cache/stats")
+async def get_search_cache_stats():
+    """
+    Get hit/miss statistics of the search result cache.
+    """
+    return search_service_instance.get_cache_stats()
+
+@router.post("/search/cache/clear")
+async def clear_search_cache():
+    """
+    Clear the in-memory search result cache.
+    """
+    return {"cleared": search_service_instance.clear_cache()}
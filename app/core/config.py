@@ -1,8 +1,10 @@
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings
 
-# Base directory of the project
+# Base directory of the project (resolved once at import)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 # Set data path to newdata.csv
@@ -21,12 +23,48 @@ class Settings(BaseSettings):
     # Embeddings settings
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384  # Dimension of the all-MiniLM-L6-v2 model
+    EMBEDDING_INT8: bool = False  # Apply dynamic INT8 quantization to the model for faster CPU inference
+    EMBEDDING_BACKEND: Literal["torch", "onnx"] = "torch"  # "torch" (sentence-transformers) or "onnx" (ONNX Runtime)
+    EMBEDDING_DTYPE: Literal["float16", "float32"] = "float16"  # Storage dtype of the embedding matrix sidecar
+    
+    # Directory of the ONNX-exported embedding model, used when EMBEDDING_BACKEND is "onnx"
+    ONNX_MODEL_PATH: str = os.path.join(BASE_DIR, "data", "onnx_minilm")
     
     # Vector DB settings path where the vector database will store its files
     VECTOR_DB_PATH: str = os.path.join(BASE_DIR, "data", "vectordb")
     
+    # Precision of the in-memory embedding matrix used for scoring: "float32", "float16"
+    # or "int8" (float16 and int8 need simsimd to be faster than float32)
+    SEARCH_DTYPE: Literal["float32", "float16", "int8"] = "float32"
+    
+    # Above this many embeddings, unfiltered searches use an HNSW index (if usearch is
+    # installed) instead of an exact scan over the in-memory embedding matrix
+    EXACT_SEARCH_MAX_ROWS: int = 100_000
+    
+    # In-process HNSW index settings (used when usearch is installed)
+    VECTOR_INDEX_CONNECTIVITY: int = 16
+    VECTOR_INDEX_EXPANSION_ADD: int = 64
+    VECTOR_INDEX_EXPANSION_SEARCH: int = 64
+    
     # API settings
     DEFAULT_RESULTS_LIMIT: int = 5
+    MAX_RESULTS_LIMIT: int = 100  # Larger limits are rejected
+    MAX_BATCH_QUERIES: int = 32  # Batch searches with more queries are rejected
+    MAX_QUERY_LENGTH: int = 512  # Longer queries are rejected
+    MAX_QUERY_CHARS: int = 256  # Queries are truncated to this many characters before embedding
+    
+    # Origins allowed to make cross-origin requests; CORS middleware is skipped if empty
+    CORS_ORIGINS: List[str] = []
+    
+    # Number of threads running searches off the event loop (defaults to CPU count)
+    SEARCH_WORKERS: Optional[int] = None
+    
+    # Search result cache settings
+    SEARCH_CACHE_SIZE: int = 4096
+    SEARCH_CACHE_TTL_SECONDS: int = 300
+    
+    # Number of query embeddings kept in memory; embeddings never go stale, so they don't expire
+    EMBEDDING_CACHE_SIZE: int = 4096
     
     model_config = {
         "case_sensitive": True,
@@ -34,4 +72,12 @@ class Settings(BaseSettings):
         "env_file_encoding": "utf-8"
     }
 
-settings = Settings() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings.
+    The .env file and environment are only read the first time this is called.
+    """
+    return Settings()
+
+settings = get_settings() 
\ No newline at end of file
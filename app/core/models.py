@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from dataclasses import dataclass
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional
+
+from app.core.config import settings
 
 class CompanyBase(BaseModel):
     """Base model for company information."""
@@ -8,11 +11,18 @@ class CompanyBase(BaseModel):
     sector: str
     description: str
 
-class Company(CompanyBase):
-    """Model representing a company with all its data."""
-    combined_text: Optional[str] = None
-    
-    model_config = ConfigDict(from_attributes=True)
+@dataclass(frozen=True, slots=True)
+class Company:
+    """
+    Internal record representing a company with all its data.
+    A slotted dataclass rather than a pydantic model, as it is never validated
+    or serialized by the API and is created for every row of the dataset.
+    """
+    company_name: str
+    stock_symbol: str
+    sector: str
+    description: str
+    combined_text: str = ""  # Only needed while generating embeddings
 
 class CompanyResult(CompanyBase):
     """Model representing a company search result with similarity score."""
@@ -24,8 +34,30 @@ class SearchResponse(BaseModel):
     count: int
     query: str
 
+class BatchSearchRequest(BaseModel):
+    """Model for the batch search endpoint request."""
+    queries: List[Annotated[str, Field(min_length=1, max_length=settings.MAX_QUERY_LENGTH)]] = Field(
+        ..., min_length=1, max_length=settings.MAX_BATCH_QUERIES, description="Search query strings"
+    )
+    limit: int = Field(
+        settings.DEFAULT_RESULTS_LIMIT,
+        ge=1,
+        le=settings.MAX_RESULTS_LIMIT,
+        description="Maximum number of results to return per query"
+    )
+    sector: Optional[str] = Field(None, description="Filter results by sector")
+
+class BatchSearchResponse(BaseModel):
+    """Model for the batch search endpoint response."""
+    results: List[SearchResponse]
+    count: int
+
 class EmbeddingConfig(BaseModel):
     """Configuration for the embedding service."""
     model_name: str = "all-MiniLM-L6-v2"
     batch_size: int = 32
-    max_seq_length: int = 256 
\ No newline at end of file
+    setup_batch_size: int = 64
+    max_seq_length: int = 256
+    quantize_int8: bool = False
+    backend: Literal["torch", "onnx"] = "torch"
+    onnx_model_path: Optional[str] = None 
\ No newline at end of file
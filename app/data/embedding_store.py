@@ -0,0 +1,79 @@
+import numpy as np
+from typing import List, Optional, Tuple
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# File names of the embedding matrix sidecar stored alongside the vector database
+EMBEDDINGS_FILE = "embeddings.npy"
+EMBEDDING_IDS_FILE = "embedding_ids.npy"
+
+def save_embeddings(directory: str, ids: List[str], embeddings: np.ndarray, dtype: str = "float16"):
+    """
+    Save the company embedding matrix as a compact NumPy sidecar file.
+    
+    Args:
+        directory: Directory to write the sidecar files to (normally the vector DB path).
+        ids: Stock symbols, one per embedding row.
+        embeddings: Matrix of shape (len(ids), dimension).
+        dtype: Storage dtype for the matrix, e.g. "float16" or "float32".
+    """
+    os.makedirs(directory, exist_ok=True)
+    matrix = np.ascontiguousarray(embeddings, dtype=dtype)
+    
+    # Running API workers keep the matrix memory-mapped, so never truncate the files in place:
+    # write new files next to them and swap them in, ids last so readers never see new ids
+    # with an old matrix
+    embeddings_tmp = _write_temp_array(directory, EMBEDDINGS_FILE, matrix)
+    ids_tmp = _write_temp_array(directory, EMBEDDING_IDS_FILE, np.asarray(ids, dtype=str))
+    os.replace(embeddings_tmp, os.path.join(directory, EMBEDDINGS_FILE))
+    os.replace(ids_tmp, os.path.join(directory, EMBEDDING_IDS_FILE))
+    logger.info(f"Saved {matrix.shape[0]} {dtype} embeddings to {directory}")
+
+def _write_temp_array(directory: str, filename: str, array: np.ndarray) -> str:
+    """
+    Save an array to a temporary file in the given directory.
+    
+    Args:
+        directory: Directory to write the file to (same filesystem as the final path).
+        filename: Final file name, used as the prefix of the temporary file.
+        array: Array to save.
+        
+    Returns:
+        Path of the temporary file.
+    """
+    fd, path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+def load_embeddings(directory: str, mmap_mode: Optional[str] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Load the company embedding matrix sidecar.
+    
+    Args:
+        directory: Directory containing the sidecar files.
+        mmap_mode: If set (e.g. "r"), memory-map the embedding matrix instead of reading it,
+            so processes loading the same file share its pages through the page cache.
+        
+    Returns:
+        Tuple of (stock symbol array, embedding matrix), or None if no sidecar exists.
+    """
+    embeddings_path = os.path.join(directory, EMBEDDINGS_FILE)
+    ids_path = os.path.join(directory, EMBEDDING_IDS_FILE)
+    if not (os.path.exists(embeddings_path) and os.path.exists(ids_path)):
+        return None
+    
+    ids = np.load(ids_path, allow_pickle=False)
+    embeddings = np.load(embeddings_path, mmap_mode=mmap_mode, allow_pickle=False)
+    if len(ids) != len(embeddings):
+        logger.warning(f"Embedding sidecar in {directory} is inconsistent, ignoring it")
+        return None
+    
+    return ids, embeddings
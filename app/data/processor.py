@@ -1,11 +1,17 @@
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Optional, Tuple
 import logging
-from pathlib import Path
+import os
+import pickle
 
 from app.core.config import settings
 from app.core.models import Company
 
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - pyarrow is an optional accelerator
+    pacsv = None
+
 logger = logging.getLogger(__name__)
 
 class DataProcessor:
@@ -22,6 +28,12 @@ class DataProcessor:
         "description": "description"
     }
     
+    # Normalized columns that make up a company record, in combined_text order
+    COMPANY_FIELDS = ["company_name", "stock_symbol", "sector", "description"]
+    
+    # Bump when the cached representation of companies changes
+    CACHE_VERSION = 2
+    
     def __init__(self, data_path: Optional[str] = None):
         """
         Initialize the data processor.
@@ -31,6 +43,9 @@ class DataProcessor:
         """
         self.data_path = data_path or settings.DATA_PATH
         self.companies = []
+        
+        # Processed companies are cached next to the CSV so warm restarts skip parsing
+        self._cache_path = f"{self.data_path}.companies.pkl"
     
     def get_companies(self) -> List[Company]:
         """
@@ -40,10 +55,15 @@ class DataProcessor:
             List of Company objects.
         """
         if not self.companies:
+            cache_key = self._cache_key()
+            self.companies = self._load_cache(cache_key)
+            if self.companies:
+                return self.companies
+            
             logger.info(f"Loading data from {self.data_path}")
             try:
                 # Load CSV data
-                raw_data = pd.read_csv(self.data_path)
+                raw_data = self._read_csv()
                 logger.info(f"Successfully loaded {len(raw_data)} companies")
                 
                 # Handle missing values
@@ -52,31 +72,106 @@ class DataProcessor:
                 # Normalize column names
                 processed_data = self._normalize_column_names(processed_data)
                 
-                # Create companies list
-                self.companies = []
+                # Extract each field once as an array, then build the combined text for
+                # semantic search with a single join per row (used by data_embedding_setup.py)
+                columns = processed_data[self.COMPANY_FIELDS].astype(str)
+                names, symbols, sectors, descriptions = (
+                    columns[field].to_numpy() for field in self.COMPANY_FIELDS
+                )
+                combined_texts = [" ".join(values) for values in zip(names, symbols, sectors, descriptions)]
                 
-                for _, row in processed_data.iterrows():
-                    # Create combined text for semantic search (used by data_embedding_setup.py)
-                    combined_text = f"{row['company_name']} {row['stock_symbol']} {row['sector']} {row['description']}"
-                    
-                    # Create company object
-                    company = Company(
-                        company_name=row['company_name'],
-                        stock_symbol=row['stock_symbol'],
-                        sector=row['sector'],
-                        description=row['description'],
+                # Create company objects from the column values
+                self.companies = [
+                    Company(
+                        company_name=company_name,
+                        stock_symbol=stock_symbol,
+                        sector=sector,
+                        description=description,
                         combined_text=combined_text
                     )
-                    
-                    self.companies.append(company)
+                    for company_name, stock_symbol, sector, description, combined_text in zip(
+                        names, symbols, sectors, descriptions, combined_texts
+                    )
+                ]
                 
                 logger.info(f"Successfully processed {len(self.companies)} companies")
             except Exception as e:
                 logger.error(f"Error processing data: {str(e)}")
                 raise
+            
+            self._write_cache(cache_key)
         
         return self.companies
     
+    def _cache_key(self) -> Tuple[int, str, float, int]:
+        """
+        Build the key identifying the current version of the CSV file.
+        
+        Returns:
+            Tuple of (cache version, path, modification time, size) for the data file.
+        """
+        stat = os.stat(self.data_path)
+        return (self.CACHE_VERSION, os.path.abspath(self.data_path), stat.st_mtime, stat.st_size)
+    
+    def _load_cache(self, cache_key: Tuple[int, str, float, int]) -> List[Company]:
+        """
+        Load processed companies from the on-disk cache if it matches the CSV.
+        
+        Args:
+            cache_key: Key of the current CSV file, as returned by _cache_key.
+            
+        Returns:
+            List of cached Company objects, or an empty list if the cache is missing or stale.
+        """
+        if not os.path.exists(self._cache_path):
+            return []
+        
+        try:
+            with open(self._cache_path, "rb") as f:
+                cached_key, companies = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable company cache {self._cache_path}: {str(e)}")
+            return []
+        
+        if cached_key != cache_key:
+            logger.info("Company cache is stale, reloading data from CSV")
+            return []
+        
+        logger.info(f"Loaded {len(companies)} companies from cache {self._cache_path}")
+        return companies
+    
+    def _write_cache(self, cache_key: Tuple[int, str, float, int]):
+        """
+        Write the processed companies to the on-disk cache.
+        
+        Args:
+            cache_key: Key of the CSV file the companies were loaded from.
+        """
+        try:
+            with open(self._cache_path, "wb") as f:
+                pickle.dump((cache_key, self.companies), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.warning(f"Could not write company cache {self._cache_path}: {str(e)}")
+    
+    def _read_csv(self) -> pd.DataFrame:
+        """
+        Read the CSV data file into a DataFrame.
+        Uses pyarrow's multi-threaded CSV reader when available and falls back to pandas.
+        
+        Returns:
+            DataFrame with the raw CSV contents.
+        """
+        if pacsv is None:
+            return pd.read_csv(self.data_path)
+        
+        table = pacsv.read_csv(
+            self.data_path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=False)
+        )
+        return table.to_pandas()
+    
     def _normalize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize column names to a standard format.
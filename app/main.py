@@ -1,10 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.openapi.utils import get_openapi
 import logging
 import os
 
-from app.api.routes import router as api_router, search_service_instance
+# Searches run concurrently on a thread pool, so keep each embedding call single-threaded
+# to avoid oversubscribing the CPU (must be set before torch is imported)
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+from app.api.routes import (
+    router as api_router,
+    initialize_search_service,
+    is_search_service_ready,
+    search_executor,
+    DefaultResponse,
+)
 from app.core.config import settings
 
 # Configure logging
@@ -33,25 +42,28 @@ def create_app() -> FastAPI:
         title="Semantic Company Search API",
         description="API for semantic search of company information",
         version="1.0.0",
+        default_response_class=DefaultResponse,
     )
 
-    # Add CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    # Add CORS middleware only when cross-origin access is configured, so it
+    # doesn't run on every request otherwise
+    if settings.CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.CORS_ORIGINS,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
 
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
 
     # Register startup event to check and initialize search service
     @app.on_event("startup")
-    def initialize_services():
-        """Initialize services at application startup."""
-        logger.info("Application starting: Pre-initializing search service")
+    async def initialize_services():
+        """Start initializing services in the background at application startup."""
+        logger.info("Application starting: Initializing search service in the background")
         
         # Check if vector database directory exists
         if not os.path.exists(settings.VECTOR_DB_PATH):
@@ -61,10 +73,14 @@ def create_app() -> FastAPI:
                 "to set up the vector database before using the search functionality."
             )
         
-        # Preload the embedding model for query processing
-        search_service_instance.preload_all_components()
-        
-        logger.info("All services initialized and ready")
+        # Connect to the vector database and preload the embedding model without
+        # blocking startup; search requests wait until this has finished
+        initialize_search_service()
+
+    @app.on_event("shutdown")
+    def shutdown_services():
+        """Stop the search thread pool at application shutdown."""
+        search_executor.shutdown(wait=False, cancel_futures=True)
 
     return app
 
@@ -81,6 +97,17 @@ async def root():
         "search_endpoint": "/api/v1/search?query=your_search_query",
     }
 
+@app.get("/health")
+async def health():
+    """
+    Lightweight health check for load balancers and readiness probes.
+    Does not wait for the search service, so it answers even while the model is loading.
+    """
+    return {
+        "status": "ok",
+        "ready": is_search_service_ready(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """
+    Thread-safe in-memory LRU cache with time-based expiry for search results.
+    Keeps hit/miss/eviction counters for monitoring.
+    """
+    
+    def __init__(self, max_size: int = 4096, ttl_seconds: Optional[float] = 300):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries to keep before evicting the least recently used.
+            ttl_seconds: Lifetime of an entry in seconds. If None, entries never expire.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value and mark it as most recently used.
+        
+        Args:
+            key: Cache key.
+            
+        Returns:
+            The cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+        
+        Args:
+            key: Cache key.
+            value: Value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with the current size, hit/miss/eviction counts and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
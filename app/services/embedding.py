@@ -1,13 +1,94 @@
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+import inspect
 import logging
+import os
+import threading
+import torch
+from tqdm import tqdm
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import settings
 from app.core.models import Company, EmbeddingConfig
+from app.services.similarity import l2_normalize_inplace
 
 logger = logging.getLogger(__name__)
 
+class OnnxSentenceEncoder:
+    """
+    Sentence encoder running an ONNX-exported transformer with ONNX Runtime.
+    Exposes the subset of the SentenceTransformer encode() interface used by
+    EmbeddingService, applying mean pooling and L2 normalization like all-MiniLM-L6-v2.
+    """
+    
+    def __init__(self, model_path: str, max_seq_length: int = 256):
+        """
+        Load the ONNX model and its tokenizer.
+        
+        Args:
+            model_path: Directory containing the exported ONNX model and tokenizer files.
+            max_seq_length: Maximum number of tokens per input text.
+        """
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        # Honour the same thread budget as torch so concurrent searches don't oversubscribe
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = int(os.environ.get("OMP_NUM_THREADS", os.cpu_count()))
+        
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.session = ORTModelForFeatureExtraction.from_pretrained(
+            model_path,
+            provider="CPUExecutionProvider",
+            session_options=session_options
+        )
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """
+        Encode one or more texts into normalized embeddings.
+        
+        Args:
+            sentences: A single text or a list of texts.
+            batch_size: Number of texts per ONNX Runtime call.
+            show_progress_bar: Whether to display a progress bar over batches.
+            
+        Returns:
+            A 1-D embedding for a single text, or a 2-D array with one row per text.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        
+        batches = range(0, len(texts), batch_size)
+        if show_progress_bar:
+            batches = tqdm(batches, desc="Batches")
+        
+        embeddings = []
+        for start in batches:
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            token_embeddings = self.session(**inputs).last_hidden_state
+            
+            # Mean-pool over non-padding tokens, then L2-normalize
+            mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            embeddings.append(pooled.astype(np.float32))
+        
+        result = np.vstack(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+        return result[0] if single else result
+
 class EmbeddingService:
     """
     Service for generating embeddings for queries and during setup.
@@ -15,15 +96,23 @@ class EmbeddingService:
     """
     
     _instance = None
+    # Guards singleton creation and construction
+    _lock = threading.Lock()
+    # Ensures concurrent first queries load the model only once
+    _model_lock = threading.Lock()
     
     def __new__(cls, *args, **kwargs):
         """
         Ensure only one instance of EmbeddingService is created (Singleton pattern).
         """
+        # Double-checked locking: skip the lock once the instance exists
         if cls._instance is None:
-            logger.info("Creating EmbeddingService singleton instance")
-            cls._instance = super(EmbeddingService, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    logger.info("Creating EmbeddingService singleton instance")
+                    instance = super(EmbeddingService, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self, config: Optional[EmbeddingConfig] = None):
@@ -33,28 +122,86 @@ class EmbeddingService:
         Args:
             config: Configuration for the embedding model.
         """
-        if not hasattr(self, '_initialized') or not self._initialized:
-            logger.info("Initializing EmbeddingService")
-            self.config = config or EmbeddingConfig(model_name=settings.EMBEDDING_MODEL)
-            self._model = None
-            self._initialized = True
-        else:
-            logger.debug("EmbeddingService already initialized, skipping initialization")
+        with self._lock:
+            if not hasattr(self, '_initialized') or not self._initialized:
+                logger.info("Initializing EmbeddingService")
+                self.config = config or EmbeddingConfig(
+                    model_name=settings.EMBEDDING_MODEL,
+                    quantize_int8=settings.EMBEDDING_INT8,
+                    backend=settings.EMBEDDING_BACKEND,
+                    onnx_model_path=settings.ONNX_MODEL_PATH
+                )
+                self._model = None
+                self._initialized = True
+            else:
+                logger.debug("EmbeddingService already initialized, skipping initialization")
     
     @property
-    def model(self) -> SentenceTransformer:
+    def model(self) -> Union[SentenceTransformer, OnnxSentenceEncoder]:
         """
         Lazy-load the embedding model.
         
         Returns:
-            SentenceTransformer model.
+            SentenceTransformer model, or an ONNX Runtime encoder if the "onnx" backend is configured.
         """
         if self._model is None:
-            logger.info(f"Loading embedding model: {self.config.model_name}")
-            self._model = SentenceTransformer(self.config.model_name)
-            logger.info(f"Model loaded with embedding dimension: {settings.EMBEDDING_DIMENSION}")
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
         return self._model
     
+    def _load_model(self) -> Union[SentenceTransformer, OnnxSentenceEncoder]:
+        """
+        Load the configured embedding model.
+        
+        Returns:
+            SentenceTransformer model, or an ONNX Runtime encoder if the "onnx" backend is configured.
+        """
+        if self.config.backend == "onnx":
+            logger.info(f"Loading ONNX embedding model from: {self.config.onnx_model_path}")
+            model = OnnxSentenceEncoder(
+                self.config.onnx_model_path,
+                max_seq_length=self.config.max_seq_length
+            )
+        else:
+            logger.info(f"Loading embedding model: {self.config.model_name}")
+            model = self._load_sentence_transformer()
+            if self.config.quantize_int8:
+                self._quantize_model(model)
+        logger.info(f"Model loaded with embedding dimension: {settings.EMBEDDING_DIMENSION}")
+        return model
+    
+    def _load_sentence_transformer(self) -> SentenceTransformer:
+        """
+        Load the SentenceTransformer model.
+        When the installed sentence-transformers forwards model_kwargs to transformers,
+        weights are loaded with low_cpu_mem_usage so the safetensors file is memory-mapped
+        instead of being materialized twice while the model is built.
+        
+        Returns:
+            SentenceTransformer model.
+        """
+        kwargs = {}
+        if "model_kwargs" in inspect.signature(SentenceTransformer.__init__).parameters:
+            kwargs["model_kwargs"] = {"low_cpu_mem_usage": True}
+        return SentenceTransformer(self.config.model_name, **kwargs)
+    
+    def _quantize_model(self, model: SentenceTransformer):
+        """
+        Replace the transformer's linear layers with dynamically quantized INT8 versions.
+        Speeds up CPU inference with negligible loss in embedding quality.
+        
+        Args:
+            model: SentenceTransformer model to quantize in place.
+        """
+        logger.info("Applying dynamic INT8 quantization to embedding model")
+        transformer = model[0]
+        transformer.auto_model = torch.quantization.quantize_dynamic(
+            transformer.auto_model,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+    
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a query text.
@@ -64,9 +211,49 @@ class EmbeddingService:
             text: The query text to generate embedding for.
             
         Returns:
-            Numpy array of the embedding vector.
+            Numpy array of the unit-length float32 embedding vector.
+        """
+        return l2_normalize_inplace(self.model.encode(text, show_progress_bar=False))
+    
+    def generate_query_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several query texts in a single batched encode.
+        
+        Args:
+            texts: The query texts to generate embeddings for.
+            
+        Returns:
+            Numpy array of shape (len(texts), dimension) with one unit-length embedding per text.
         """
-        return self.model.encode(text, show_progress_bar=False)
+        return l2_normalize_inplace(self.model.encode(
+            texts,
+            batch_size=self.config.batch_size,
+            show_progress_bar=False
+        ))
+    
+    def warmup(self, batch_sizes: Tuple[int, ...] = (1,), seq_length: int = 16):
+        """
+        Load the model and run it on dummy input so the first real query doesn't pay for it.
+        The PyTorch model is fed zeroed token ids directly, skipping the tokenizer and pooling;
+        ONNX Runtime caches kernels per input shape, so it encodes a batch of each size instead.
+        
+        Args:
+            batch_sizes: Batch sizes to run the model with.
+            seq_length: Number of tokens in each dummy PyTorch input.
+        """
+        model = self.model
+        if isinstance(model, OnnxSentenceEncoder):
+            for batch_size in batch_sizes:
+                model.encode(["warmup query"] * batch_size)
+        else:
+            transformer = model[0].auto_model
+            with torch.inference_mode():
+                for batch_size in batch_sizes:
+                    input_ids = torch.zeros((batch_size, seq_length), dtype=torch.long, device=model.device)
+                    transformer(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+        
+        # Compile the normalization kernel as well
+        l2_normalize_inplace(np.ones((1, settings.EMBEDDING_DIMENSION), dtype=np.float32))
     
     def generate_embeddings(self, companies: List[Company]) -> Dict[str, np.ndarray]:
         """
@@ -77,7 +264,7 @@ class EmbeddingService:
             companies: List of Company objects.
             
         Returns:
-            Dictionary mapping company stock symbols to their embeddings.
+            Dictionary mapping company stock symbols to their unit-length float32 embeddings.
         """
         logger.info(f"Generating embeddings for {len(companies)} companies")
         
@@ -85,13 +272,13 @@ class EmbeddingService:
         texts = [company.combined_text for company in companies]
         stock_symbols = [company.stock_symbol for company in companies]
         
-        # Generate embeddings in batches
-        logger.info(f"Encoding {len(texts)} company texts with batch size {self.config.batch_size}")
-        embeddings = self.model.encode(
-            texts, 
-            batch_size=self.config.batch_size,
+        # Generate all embeddings in one batched encode, normalized in place as a single matrix
+        logger.info(f"Encoding {len(texts)} company texts with batch size {self.config.setup_batch_size}")
+        embeddings = l2_normalize_inplace(self.model.encode(
+            texts,
+            batch_size=self.config.setup_batch_size,
             show_progress_bar=True
-        )
+        ))
         
         # Create mapping from stock symbol to embedding
         embeddings_dict = {symbol: embedding for symbol, embedding in zip(stock_symbols, embeddings)}
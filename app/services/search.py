@@ -1,15 +1,34 @@
 import logging
 import numpy as np
 import chromadb
+import mmap
 import os
-from typing import List, Optional, Dict
+import threading
+from typing import Any, List, Optional, Dict
 
 from app.core.config import settings
-from app.core.models import Company, CompanyResult
+from app.core.models import Company
+from app.data.embedding_store import load_embeddings
+from app.services.cache import QueryCache
 from app.services.embedding import EmbeddingService
+from app.services.similarity import dot_scores, l2_normalize_rows, quantize_int8, simsimd, top_k
+
+try:
+    from usearch.index import Index
+except ImportError:  # pragma: no cover - usearch is an optional accelerator
+    Index = None
 
 logger = logging.getLogger(__name__)
 
+# usearch scalar kinds for the supported embedding storage dtypes
+USEARCH_DTYPES = {"float16": "f16", "float32": "f32"}
+
+# Batch sizes the embedding model is warmed up with at startup (matching batch search sizes)
+WARMUP_BATCH_SIZES = (1, 8, 32)
+
+# Number of metadata entries fetched from the vector database per request at startup
+METADATA_PAGE_SIZE = 1000
+
 class SearchService:
     """
     Service for semantic search functionality.
@@ -17,34 +36,74 @@ class SearchService:
     """
     
     _instance = None
+    # Guards singleton creation and construction
+    _lock = threading.Lock()
+    # Serializes initialize() so concurrent callers connect to the vector database only once
+    _initialize_lock = threading.Lock()
     
     def __new__(cls):
         """
         Ensure only one instance of SearchService is created (Singleton pattern).
         """
+        # Double-checked locking: skip the lock once the instance exists
         if cls._instance is None:
-            logger.info("Creating SearchService singleton instance")
-            cls._instance = super(SearchService, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    logger.info("Creating SearchService singleton instance")
+                    instance = super(SearchService, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
         """
-        Initialize the search service with data processing and embedding components.
-        This will only execute its code once due to the singleton pattern.
+        Create the search service without touching the vector database.
+        This will only execute its code once due to the singleton pattern;
+        call initialize() to connect to the vector database and load metadata.
         """
-        if not hasattr(self, '_initialized') or not self._initialized:
-            logger.info("Initializing SearchService components")
-            self.embedding_service = EmbeddingService()
-            self.companies = {}
-            self.vector_db = None
-            self.collection = None
+        with self._lock:
+            if not hasattr(self, '_initialized') or not self._initialized:
+                logger.info("Creating SearchService components")
+                self.embedding_service = EmbeddingService()
+                self.companies = {}
+                self._result_templates = {}
+                self.vector_db = None
+                self.collection = None
+                self._index = None
+                self._embedding_matrix = None
+                self._row_scales = None
+                self._row_templates = []
+                self._sector_slices = {}
+                self._mapped_files = []
+                self._loaded = False
             
-            # Initialize components
-            self._initialize()
-            self._initialized = True
-        else:
-            logger.debug("SearchService already initialized, skipping initialization")
+                # Cache of search results keyed by normalized (query, limit, sector)
+                self._query_cache = QueryCache(
+                    max_size=settings.SEARCH_CACHE_SIZE,
+                    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS
+                )
+                # Cache of query embeddings keyed by normalized query, shared across limits and sectors
+                self._embedding_cache = QueryCache(
+                    max_size=settings.EMBEDDING_CACHE_SIZE,
+                    ttl_seconds=None
+                )
+                self._initialized = True
+            else:
+                logger.debug("SearchService already initialized, skipping initialization")
+    
+    def initialize(self):
+        """
+        Connect to the vector database and load company metadata.
+        This is the expensive part of start-up, so it is kept out of the constructor
+        and can be run in a worker thread. Calling it again is a no-op.
+        """
+        # Double-checked locking: only the first caller initializes, the others wait for it
+        if not self._loaded:
+            with self._initialize_lock:
+                if not self._loaded:
+                    self._initialize()
+                    self._loaded = True
+        return self
     
     def _initialize(self):
         """
@@ -53,6 +112,9 @@ class SearchService:
         """
         logger.info("Initializing search service")
         
+        # Start reading the vector DB files into the page cache while the rest loads
+        self._prefetch_vector_db_files()
+        
         # Set up vector DB connection
         self._setup_vector_db()
         
@@ -67,42 +129,238 @@ class SearchService:
             logger.info(f"Vector database contains {vector_count} entries")
         
         # Load only company metadata from the vector database
-        self._load_company_metadata_from_db()
+        self._load_company_metadata_from_db(vector_count)
+        
+        # Warm the embedding matrix and in-process vector index into RAM
+        self._load_embedding_matrix()
         
         logger.info("Search service initialization complete")
     
-    def _load_company_metadata_from_db(self):
+    def _prefetch_vector_db_files(self):
+        """
+        Memory-map the vector database files and ask the OS to read them ahead.
+        The reads overlap with opening the database and loading the embedding model,
+        so the first queries don't hit a cold disk. The mappings are kept open for
+        the lifetime of the service.
+        """
+        if not hasattr(mmap, "MADV_WILLNEED") or not os.path.isdir(settings.VECTOR_DB_PATH):
+            return
+        
+        prefetched_bytes = 0
+        for directory, _, filenames in os.walk(settings.VECTOR_DB_PATH):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    with open(path, "rb") as f:
+                        if os.fstat(f.fileno()).st_size == 0:
+                            continue
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    mapped.madvise(mmap.MADV_WILLNEED)
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Could not prefetch {path}: {str(e)}")
+                    continue
+                
+                self._mapped_files.append(mapped)
+                prefetched_bytes += len(mapped)
+        
+        logger.info(f"Prefetching {len(self._mapped_files)} vector database files ({prefetched_bytes} bytes)")
+    
+    def _load_company_metadata_from_db(self, vector_count: int):
         """
         Load company metadata directly from the vector database instead of CSV.
         This eliminates the need to re-read the CSV file on each application restart.
+        
+        Args:
+            vector_count: Number of entries in the vector database.
         """
         logger.info("Loading company metadata from vector database")
         
-        # Query the database with a dummy embedding to get all entries
-        # This is more efficient than reading from CSV
-        all_items = self.collection.get(
-            limit=10000  # Set a large limit to get all items
-        )
+        if vector_count == 0:
+            logger.warning("No metadata found in vector database")
+            return
         
-        # Process the metadata from the vector database
-        if all_items and "ids" in all_items and all_items["ids"]:
-            for i, stock_symbol in enumerate(all_items["ids"]):
-                if "metadatas" in all_items and all_items["metadatas"]:
-                    metadata = all_items["metadatas"][i]
-                    # Create a Company object from the metadata
-                    company = Company(
-                        company_name=metadata.get("company_name", ""),
-                        stock_symbol=stock_symbol,
-                        sector=metadata.get("sector", ""),
-                        description=metadata.get("description", ""),
-                        # No need for combined_text as we don't use it at runtime
-                    )
-                    self.companies[stock_symbol] = company
+        # Fetch the metadata page by page so only one page of results is held at a time;
+        # documents and embeddings aren't needed
+        for offset in range(0, vector_count, METADATA_PAGE_SIZE):
+            page = self.collection.get(
+                limit=METADATA_PAGE_SIZE,
+                offset=offset,
+                include=["metadatas"]
+            )
+            if not page["ids"]:
+                break
             
+            for stock_symbol, metadata in zip(page["ids"], page["metadatas"]):
+                # Create a Company object from the metadata
+                company = Company(
+                    company_name=metadata.get("company_name", ""),
+                    stock_symbol=stock_symbol,
+                    sector=metadata.get("sector", ""),
+                    description=metadata.get("description", ""),
+                    # No need for combined_text as we don't use it at runtime
+                )
+                self.companies[stock_symbol] = company
+                
+                # Precompute the result payload so searches only need to attach a score
+                self._result_templates[stock_symbol] = {
+                    "company_name": company.company_name,
+                    "stock_symbol": company.stock_symbol,
+                    "sector": company.sector,
+                    "description": company.description
+                }
+        
+        if self.companies:
             logger.info(f"Loaded metadata for {len(self.companies)} companies from vector database")
         else:
             logger.warning("No metadata found in vector database")
     
+    def _load_embedding_matrix(self):
+        """
+        Load the embedding matrix sidecar into RAM for in-process search.
+        Keeps an L2-normalized float32 copy, with rows grouped by sector, for exact
+        scans and, for large datasets, an HNSW index. Without the
+        sidecar, searches go through the vector database instead.
+        """
+        # Memory-map the sidecar so workers that can use it unmodified share its pages
+        sidecar = load_embeddings(settings.VECTOR_DB_PATH, mmap_mode="r")
+        if sidecar is None:
+            logger.warning(
+                "No embedding matrix found next to the vector database, searching through "
+                "the vector database. Run data_embedding_setup.py --force to create it."
+            )
+            return
+        
+        stock_symbols, embeddings = sidecar
+        
+        # Rows are addressed by position, so result templates can be looked up by row number
+        row_templates = [self._result_templates.get(symbol) for symbol in stock_symbols.tolist()]
+        
+        # Drop embeddings without metadata up front so searches never have to skip rows
+        known_rows = np.array([template is not None for template in row_templates], dtype=bool)
+        if not known_rows.all():
+            logger.warning(f"Ignoring {int((~known_rows).sum())} embeddings without metadata")
+            embeddings = embeddings[known_rows]
+            row_templates = [template for template in row_templates if template is not None]
+        
+        # Order rows by sector so each sector is a contiguous slice of the matrix
+        row_sectors = np.array([template["sector"] for template in row_templates])
+        order = np.argsort(row_sectors, kind="stable")
+        if np.any(order != np.arange(len(order))):
+            embeddings = embeddings[order]
+            row_sectors = row_sectors[order]
+            row_templates = [row_templates[row] for row in order.tolist()]
+        self._row_templates = row_templates
+        
+        # Unit-length rows make cosine similarity a single matrix-vector product
+        self._embedding_matrix = self._normalized_embedding_matrix(embeddings)
+        if settings.SEARCH_DTYPE == "int8":
+            self._quantize_embedding_matrix()
+        elif settings.SEARCH_DTYPE == "float16":
+            self._half_embedding_matrix()
+        self._build_sector_slices(row_sectors)
+        
+        # An exact scan beats an approximate index until the dataset gets large
+        if len(embeddings) > settings.EXACT_SEARCH_MAX_ROWS:
+            self._build_vector_index(embeddings)
+    
+    def _normalized_embedding_matrix(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Get the L2-normalized embedding matrix to search.
+        If the memory-mapped sidecar already has unit-length rows in the dtype searches use,
+        the mapping is used directly, so every worker process shares the same physical pages
+        instead of holding its own copy.
+        
+        Args:
+            embeddings: Embedding matrix with one row per entry in self._row_templates.
+            
+        Returns:
+            Matrix with unit-length rows, either the read-only mapping itself or a float32 copy.
+        """
+        shared_dtype = np.float16 if settings.SEARCH_DTYPE == "float16" and simsimd is not None else np.float32
+        if isinstance(embeddings, np.memmap) and embeddings.dtype == shared_dtype:
+            # Row norms without materializing a squared copy of the matrix
+            squared_norms = np.einsum("ij,ij->i", embeddings, embeddings, dtype=np.float32)
+            if np.allclose(squared_norms, 1.0, atol=1e-2):
+                logger.info(f"Searching the memory-mapped {embeddings.dtype} embedding matrix in place")
+                return embeddings
+        
+        return l2_normalize_rows(embeddings)
+    
+    def _quantize_embedding_matrix(self):
+        """
+        Quantize the normalized embedding matrix to int8 with per-row scales.
+        Quarters its memory footprint and the bandwidth needed per scan; SimSIMD
+        then scores it with int8 dot-product instructions (e.g. AVX-VNNI).
+        """
+        if simsimd is None:
+            logger.warning("SEARCH_DTYPE=int8 requires simsimd, keeping the float32 embedding matrix")
+            return
+        
+        self._embedding_matrix, self._row_scales = quantize_int8(self._embedding_matrix)
+        logger.info(f"Quantized embedding matrix to int8 ({self._embedding_matrix.nbytes} bytes)")
+    
+    def _half_embedding_matrix(self):
+        """
+        Convert the normalized embedding matrix to float16.
+        Halves its memory footprint and the bandwidth needed per scan; SimSIMD scores
+        it with native half-precision instructions (e.g. AVX-512-FP16, NEON FP16).
+        """
+        if simsimd is None:
+            # NumPy has no fast float16 kernel, a float16 scan would be slower than float32
+            logger.warning("SEARCH_DTYPE=float16 requires simsimd, keeping the float32 embedding matrix")
+            return
+        if self._embedding_matrix.dtype == np.float16:
+            return
+        
+        self._embedding_matrix = self._embedding_matrix.astype(np.float16)
+        logger.info(f"Converted embedding matrix to float16 ({self._embedding_matrix.nbytes} bytes)")
+    
+    def _build_sector_slices(self, row_sectors: np.ndarray):
+        """
+        Record the contiguous range of matrix rows belonging to each sector.
+        A sector-filtered search then scans a zero-copy view of just that sector.
+        
+        Args:
+            row_sectors: Sector of every matrix row, sorted.
+        """
+        sectors, starts, counts = np.unique(row_sectors, return_index=True, return_counts=True)
+        self._sector_slices = {
+            sector: slice(start, start + count)
+            for sector, start, count in zip(sectors.tolist(), starts.tolist(), counts.tolist())
+            if sector
+        }
+        
+        logger.info(f"Indexed embedding rows for {len(self._sector_slices)} sectors")
+    
+    def _build_vector_index(self, embeddings: np.ndarray):
+        """
+        Build an in-process HNSW index over the embedding matrix.
+        Searching it avoids the vector database round trip on every query.
+        
+        Args:
+            embeddings: Embedding matrix with one row per entry in self._row_templates.
+        """
+        if Index is None:
+            logger.info("usearch is not installed, using exact search over the embedding matrix")
+            return
+        
+        logger.info(f"Building in-process vector index over {len(embeddings)} embeddings")
+        
+        index = Index(
+            ndim=embeddings.shape[1],
+            metric="cos",
+            dtype=USEARCH_DTYPES.get(str(embeddings.dtype), "f32"),
+            connectivity=settings.VECTOR_INDEX_CONNECTIVITY,
+            expansion_add=settings.VECTOR_INDEX_EXPANSION_ADD,
+            expansion_search=settings.VECTOR_INDEX_EXPANSION_SEARCH
+        )
+        
+        # Index keys are row numbers into self._row_templates
+        index.add(np.arange(len(embeddings)), embeddings)
+        self._index = index
+        
+        logger.info(f"In-process vector index ready with {len(index)} vectors")
+    
     def _setup_vector_db(self):
         """
         Set up the Chroma vector database client and collection.
@@ -129,13 +387,22 @@ class SearchService:
         """
         logger.info("Preloading search components")
         
-        # Preload the embedding model for query processing
-        _ = self.embedding_service.generate_embedding("preload")
+        # Preload the embedding model (and compile the normalization kernel) for query processing,
+        # priming the batch sizes used by batch search
+        self.embedding_service.warmup(WARMUP_BATCH_SIZES)
+        
+        # Compile the scoring kernel for the matrix dtype so the first query doesn't pay for it
+        if self._embedding_matrix is not None and len(self._embedding_matrix):
+            dot_scores(
+                self._embedding_matrix[:1],
+                np.ones(self._embedding_matrix.shape[1], dtype=np.float32),
+                self._row_scales[:1] if self._row_scales is not None else None
+            )
         
         logger.info("All components preloaded and ready for queries")
         return self
     
-    def search(self, query: str, limit: int = 5, sector: Optional[str] = None) -> List[CompanyResult]:
+    def search(self, query: str, limit: int = 5, sector: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Perform semantic search for companies based on query.
         
@@ -145,45 +412,261 @@ class SearchService:
             sector: Optional sector filter.
             
         Returns:
-            List of CompanyResult objects with matching companies and similarity scores.
+            List of result dictionaries (company fields plus similarity score) for matching companies.
         """
         logger.info(f"Searching for: '{query}' (limit: {limit}, sector: {sector})")
         
-        # Generate embedding for the query
-        query_embedding = self.embedding_service.generate_embedding(query).tolist()
+        # Repeated queries are served from the cache without re-embedding the query
+        cache_key = self._cache_key(query, limit, sector)
+        results = self._query_cache.get(cache_key)
+        if results is not None:
+            logger.info(f"Found {len(results)} cached results for query: '{query}'")
+            return results
         
-        # Prepare the filter
-        where_clause = None
-        if sector:
-            where_clause = {"sector": sector}
+        # Generate embedding for the query (unless it was embedded before) and search with it
+        query_embedding = self._embed_query(query)
+        results = self._search_embeddings(query_embedding[np.newaxis], limit, sector)[0]
+        self._query_cache.put(cache_key, results)
+        
+        logger.info(f"Found {len(results)} results for query: '{query}'")
+        return results
+    
+    def search_batch(self, queries: List[str], limit: int = 5, sector: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Perform semantic search for several queries at once.
+        Queries that are not cached are embedded in a single batched encode and
+        scored together, in one pass over the in-memory embedding matrix (or one
+        vector database query if the matrix isn't loaded).
+        
+        Args:
+            queries: Search query texts.
+            limit: Maximum number of results to return per query.
+            sector: Optional sector filter applied to every query.
+            
+        Returns:
+            List with one list of result dictionaries per query, in query order.
+        """
+        logger.info(f"Batch searching {len(queries)} queries (limit: {limit}, sector: {sector})")
+        
+        # Serve repeated queries from the cache and only embed the rest
+        cache_keys = [self._cache_key(query, limit, sector) for query in queries]
+        results = [self._query_cache.get(cache_key) for cache_key in cache_keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        
+        if missing:
+            # Generate embeddings for all uncached queries in one batch
+            query_embeddings = self._embed_queries([queries[i] for i in missing])
+            for i, query_results in zip(missing, self._search_embeddings(query_embeddings, limit, sector)):
+                results[i] = query_results
+                self._query_cache.put(cache_keys[i], query_results)
+        
+        return results
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """
+        Get the embedding of a query, generating it only if it is not cached.
         
-        # Search the vector database
+        Args:
+            query: Search query text.
+            
+        Returns:
+            Unit-length float32 embedding of the query.
+        """
+        key = self._embedding_cache_key(query)
+        query_embedding = self._embedding_cache.get(key)
+        if query_embedding is None:
+            query_embedding = self.embedding_service.generate_embedding(query)
+            self._embedding_cache.put(key, query_embedding)
+        return query_embedding
+    
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Get the embeddings of several queries, generating the uncached ones in a single batch.
+        
+        Args:
+            queries: Search query texts.
+            
+        Returns:
+            Matrix with one unit-length float32 embedding per query, in query order.
+        """
+        keys = [self._embedding_cache_key(query) for query in queries]
+        query_embeddings = [self._embedding_cache.get(key) for key in keys]
+        missing = [i for i, cached in enumerate(query_embeddings) if cached is None]
+        
+        if missing:
+            generated = self.embedding_service.generate_query_embeddings([queries[i] for i in missing])
+            for i, query_embedding in zip(missing, generated):
+                query_embeddings[i] = query_embedding
+                self._embedding_cache.put(keys[i], query_embedding)
+        
+        return np.vstack(query_embeddings)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the search result cache and the query embedding cache.
+        
+        Returns:
+            Dictionary with the cache size, hits, misses, evictions and hit rate, plus the
+            same statistics for the query embedding cache under "embeddings".
+        """
+        stats = self._query_cache.stats()
+        stats["embeddings"] = self._embedding_cache.stats()
+        return stats
+    
+    def clear_cache(self) -> int:
+        """
+        Remove all entries from the search result cache.
+        
+        Returns:
+            Number of entries removed.
+        """
+        cleared = len(self._query_cache)
+        self._query_cache.clear()
+        return cleared
+    
+    def _cache_key(self, query: str, limit: int, sector: Optional[str]) -> tuple:
+        """
+        Build the result cache key for a search.
+        """
+        return (query.strip().lower(), limit, sector or "")
+    
+    def _embedding_cache_key(self, query: str) -> str:
+        """
+        Build the query embedding cache key for a query.
+        """
+        return query.strip().lower()
+    
+    def _search_embeddings(self, query_embeddings: np.ndarray, limit: int, sector: Optional[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Search with one or more query embeddings.
+        
+        Args:
+            query_embeddings: Matrix with one query embedding per row.
+            limit: Maximum number of results to return per query.
+            sector: Optional sector filter applied to every query.
+            
+        Returns:
+            List with one list of result dictionaries per query embedding.
+        """
+        # Search in memory if possible, otherwise the vector database
+        if self._can_search_in_memory():
+            return self._search_in_memory(query_embeddings, limit, sector)
+        
+        # Search the vector database with all query vectors at once
         search_results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings.tolist(),
             n_results=limit,
-            where=where_clause
+            where=self._where_clause(sector),
+            # Results are built from the preloaded templates, so only distances are needed
+            include=["distances"]
+        )
+        
+        # Process results per query
+        if not search_results["ids"]:
+            return [[] for _ in query_embeddings]
+        return [self._build_results(search_results, i) for i in range(len(query_embeddings))]
+    
+    def _can_search_in_memory(self) -> bool:
+        """
+        Check whether searches can be served without querying the vector database.
+        
+        Returns:
+            True if the in-memory embedding matrix is loaded.
+        """
+        return self._embedding_matrix is not None
+    
+    def _search_in_memory(self, query_embeddings: np.ndarray, limit: int, sector: Optional[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Search the in-memory embeddings.
+        Sector-filtered searches do an exact scan over the sector's embeddings. Unfiltered
+        searches use the HNSW index if one was built, and an exact scan otherwise. Exact
+        scans score all queries in a single pass over the matrix.
+        
+        Args:
+            query_embeddings: Matrix with one query embedding per row.
+            limit: Maximum number of results to return per query.
+            sector: Optional sector filter.
+            
+        Returns:
+            List with one list of result dictionaries, ordered by relevance, per query embedding.
+        """
+        if self._index is not None and not sector:
+            results = []
+            for query_embedding in query_embeddings:
+                matches = self._index.search(query_embedding, limit)
+                # Convert distance to similarity score (1 - distance for cosine)
+                results.append(self._make_results(matches.keys.tolist(), (1 - matches.distances).tolist()))
+            return results
+        
+        if sector:
+            sector_rows = self._sector_slices.get(sector)
+            if sector_rows is None:
+                return [[] for _ in query_embeddings]
+        else:
+            sector_rows = slice(0, len(self._embedding_matrix))
+        
+        # Query embeddings are already unit length, so these are the cosine similarities
+        scores = dot_scores(
+            self._embedding_matrix[sector_rows],
+            query_embeddings,
+            self._row_scales[sector_rows] if self._row_scales is not None else None
         )
         
-        # Process results
         results = []
-        if search_results["ids"]:
-            for i, stock_symbol in enumerate(search_results["ids"][0]):
-                company = self.companies.get(stock_symbol)
-                if company:
-                    # Create company result with similarity score
-                    score = search_results["distances"][0][i] if "distances" in search_results else 1.0
-                    # Convert distance to similarity score (1 - distance for cosine)
-                    normalized_score = 1 - score
-                    
-                    result = CompanyResult(
-                        company_name=company.company_name,
-                        stock_symbol=company.stock_symbol,
-                        sector=company.sector,
-                        description=company.description,
-                        score=normalized_score
-                    )
-                    
-                    results.append(result)
+        for query_scores in scores:
+            top = top_k(query_scores, limit)
+            results.append(self._make_results((top + sector_rows.start).tolist(), query_scores[top].tolist()))
+        return results
+    
+    def _make_results(self, rows: List[int], similarities: List[float]) -> List[Dict[str, Any]]:
+        """
+        Create search results for matrix rows.
         
-        logger.info(f"Found {len(results)} results for query: '{query}'")
-        return results 
\ No newline at end of file
+        Args:
+            rows: Row numbers into self._row_templates, ordered by relevance.
+            similarities: Similarity score of each row to the query.
+            
+        Returns:
+            List of result dictionaries with the fields of CompanyResult.
+        """
+        # Every row has a template, so results are built in one pass over the gathered rows
+        row_templates = self._row_templates
+        return [
+            {**row_templates[row], "score": similarity}
+            for row, similarity in zip(rows, similarities)
+        ]
+    
+    def _where_clause(self, sector: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Build the vector database filter for an optional sector.
+        
+        Args:
+            sector: Optional sector filter.
+            
+        Returns:
+            Filter dictionary, or None if no sector is given.
+        """
+        if sector:
+            return {"sector": sector}
+        return None
+    
+    def _build_results(self, search_results: Dict, query_index: int) -> List[Dict[str, Any]]:
+        """
+        Convert the vector database results for one query into result dictionaries.
+        
+        Args:
+            search_results: Result dictionary returned by the collection query.
+            query_index: Index of the query within the (possibly batched) results.
+            
+        Returns:
+            List of result dictionaries ordered by relevance.
+        """
+        # Convert distances to similarity scores (1 - distance for cosine) in one vectorized step
+        similarities = (1.0 - np.asarray(search_results["distances"][query_index])).tolist()
+        
+        result_templates = self._result_templates
+        return [
+            {**result_templates[stock_symbol], "score": similarity}
+            for stock_symbol, similarity in zip(search_results["ids"][query_index], similarities)
+            if stock_symbol in result_templates
+        ]
@@ -0,0 +1,158 @@
+import math
+import numpy as np
+from typing import Optional, Tuple
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+
+try:
+    import simsimd
+except ImportError:  # pragma: no cover - simsimd is an optional accelerator
+    simsimd = None
+
+
+def l2_normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize the rows of a matrix so cosine similarity becomes a dot product.
+    
+    Args:
+        matrix: Matrix of shape (n, dimension) or a single vector.
+        
+    Returns:
+        Contiguous float32 array with unit-length rows.
+    """
+    normalized = np.array(matrix, dtype=np.float32, order="C")
+    norms = np.linalg.norm(normalized, axis=-1, keepdims=True)
+    normalized /= np.maximum(norms, 1e-12)
+    return normalized
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize vectors to int8 with a symmetric per-row scale.
+    
+    Args:
+        matrix: Matrix of shape (n, dimension) or a single vector.
+        
+    Returns:
+        Tuple of (int8 array with the input's shape, float32 scale per row) such that
+        quantized * scale approximates the input.
+    """
+    scales = np.maximum(np.abs(matrix).max(axis=-1, keepdims=True) / 127.0, 1e-12)
+    quantized = np.round(matrix / scales).astype(np.int8)
+    return quantized, np.squeeze(scales, axis=-1).astype(np.float32)
+
+
+def dot_scores(matrix: np.ndarray, query: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the dot product of every matrix row with one or more query vectors.
+    For unit-length rows and queries this is the cosine similarity. Uses SimSIMD's
+    vectorized kernels when simsimd is installed, otherwise a fused Numba kernel when numba
+    is installed, and a NumPy/BLAS product as the last resort. Several queries are scored
+    in a single pass over the matrix.
+    
+    Args:
+        matrix: Contiguous matrix of shape (n, dimension), float or int8.
+        query: float32 query vector of shape (dimension,), or a matrix of shape
+            (queries, dimension) with one query per row.
+        scales: Per-row scales of an int8 matrix, as returned by quantize_int8.
+        
+    Returns:
+        float32 array of n scores, or of shape (queries, n) for a query matrix.
+    """
+    queries = query[np.newaxis] if query.ndim == 1 else query
+    query_scales = None
+    if matrix.dtype == np.int8:
+        queries, query_scales = quantize_int8(queries)
+    else:
+        queries = np.ascontiguousarray(queries, dtype=matrix.dtype)
+    
+    if simsimd is not None:
+        scores = np.asarray(simsimd.cdist(queries, matrix, metric="dot"), dtype=np.float32)
+    elif njit is not None and matrix.dtype in (np.float32, np.int8):
+        # Fused kernel without temporaries (int8 rows are widened per element, not per matrix);
+        # it releases the GIL like BLAS does, so concurrent searches still scan in parallel
+        scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+        _dot_scores_numba(matrix, queries, scores)
+    elif query_scales is not None:
+        # NumPy has no int8 BLAS kernel, so widen to avoid overflow
+        scores = (queries.astype(np.int32) @ matrix.astype(np.int32).T).astype(np.float32)
+    else:
+        scores = queries @ matrix.T
+    
+    if query_scales is not None:
+        scores *= scales[np.newaxis, :] * query_scales[:, np.newaxis]
+    return scores[0] if query.ndim == 1 else scores
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Find the indices of the k highest scores, ordered from highest to lowest.
+    Uses an O(n) partial partition and only sorts the selected candidates.
+    
+    Args:
+        scores: 1-D array of similarity scores.
+        k: Number of indices to return.
+        
+    Returns:
+        Array of at most k indices into scores.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # Partition on the scores directly; negating them first would copy the whole array
+        boundary = len(scores) - k
+        candidates = np.argpartition(scores, boundary)[boundary:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _l2_normalize_rows_inplace_numpy(matrix: np.ndarray):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.maximum(norms, 1e-12)
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _l2_normalize_rows_inplace_numba(matrix):
+        for i in range(matrix.shape[0]):
+            total = 0.0
+            for j in range(matrix.shape[1]):
+                total += matrix[i, j] * matrix[i, j]
+            inv_norm = 1.0 / math.sqrt(max(total, 1e-24))
+            for j in range(matrix.shape[1]):
+                matrix[i, j] *= inv_norm
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _dot_scores_numba(matrix, queries, out):
+        # Rows in the outer loop, so each matrix row is read from memory once for all queries
+        for i in range(matrix.shape[0]):
+            for q in range(queries.shape[0]):
+                total = 0.0
+                for j in range(matrix.shape[1]):
+                    total += matrix[i, j] * queries[q, j]
+                out[q, i] = total
+    
+    _l2_normalize_rows_inplace = _l2_normalize_rows_inplace_numba
+else:
+    _l2_normalize_rows_inplace = _l2_normalize_rows_inplace_numpy
+
+
+def l2_normalize_inplace(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize an embedding or matrix of embeddings in place.
+    Uses a fused Numba kernel when numba is installed, without allocating a second array.
+    
+    Args:
+        embeddings: A single embedding vector or a matrix with one embedding per row.
+        
+    Returns:
+        The normalized float32 array (the input itself if it already was contiguous float32).
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    _l2_normalize_rows_inplace(embeddings.reshape(-1, embeddings.shape[-1]))
+    return embeddings
@@ -16,12 +16,15 @@ import sys
 import logging
 import argparse
 import chromadb
+import numpy as np
 from pathlib import Path
+from tqdm import tqdm
 
 # Add the project root to the path so we can import app modules
 sys.path.append(str(Path(__file__).resolve().parent))
 
 from app.core.config import settings
+from app.data.embedding_store import save_embeddings
 from app.data.processor import DataProcessor
 from app.services.embedding import EmbeddingService
 
@@ -40,6 +43,9 @@ logging.getLogger("sentence_transformers").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Number of records per collection.add call (ChromaDB's recommended maximum)
+DEFAULT_INSERT_BATCH_SIZE = 250
+
 def setup_vector_db():
     """
     Set up the vector database connection.
@@ -63,7 +69,7 @@ def setup_vector_db():
     
     return collection
 
-def populate_vector_db(collection, companies, embedding_service):
+def populate_vector_db(collection, companies, embedding_service, batch_size=DEFAULT_INSERT_BATCH_SIZE):
     """
     Populate the vector database with company embeddings and ALL metadata.
     
@@ -71,7 +77,19 @@ def populate_vector_db(collection, companies, embedding_service):
         collection: The ChromaDB collection
         companies: List of Company objects
         embedding_service: The embedding service to generate embeddings
+        batch_size: Number of records to add to the collection per call
     """
+    # Stock symbols are the vector database ids, so keep only the first company per symbol;
+    # otherwise a later batch fails after earlier ones were committed, and the sidecar
+    # would hold rows the collection doesn't
+    companies_by_symbol = {}
+    for company in companies:
+        companies_by_symbol.setdefault(company.stock_symbol, company)
+    unique_companies = list(companies_by_symbol.values())
+    if len(unique_companies) < len(companies):
+        logger.warning(f"Skipping {len(companies) - len(unique_companies)} companies with duplicate stock symbols")
+        companies = unique_companies
+    
     logger.info("Generating embeddings for companies")
     
     # Generate embeddings for all companies
@@ -79,7 +97,10 @@ def populate_vector_db(collection, companies, embedding_service):
     
     # Prepare data for insertion
     ids = [company.stock_symbol for company in companies]
-    embeddings = [embeddings_dict[symbol].tolist() for symbol in ids]
+    # Embeddings are unit length, so cosine similarity is a plain dot product everywhere
+    embedding_matrix = np.vstack([embeddings_dict[symbol] for symbol in ids])
+    # Convert the whole matrix to nested lists in one call rather than one row at a time
+    embeddings = embedding_matrix.tolist()
     
     # Store ALL company metadata in the vector database
     # This ensures we don't need to read from CSV at runtime
@@ -95,22 +116,36 @@ def populate_vector_db(collection, companies, embedding_service):
     
     logger.info(f"Adding {len(ids)} company embeddings and metadata to vector database")
     
-    # Add embeddings to collection
-    collection.add(
-        ids=ids,
-        embeddings=embeddings,
-        metadatas=metadatas
-    )
+    # Add embeddings to collection in batches to keep each transaction small
+    for start in tqdm(range(0, len(ids), batch_size), desc="Adding batches"):
+        end = start + batch_size
+        collection.add(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end],
+            metadatas=metadatas[start:end]
+        )
     
     logger.info(f"Successfully added {len(ids)} companies to vector database")
+    
+    # ChromaDB only stores float32 vectors, so also keep a compact copy of the
+    # embedding matrix for the in-process search index. Rows are grouped by sector,
+    # the layout searches use, so the API can memory-map the file as is
+    order = np.argsort(np.array([company.sector for company in companies]), kind="stable")
+    save_embeddings(
+        settings.VECTOR_DB_PATH,
+        [ids[row] for row in order.tolist()],
+        embedding_matrix[order],
+        dtype=settings.EMBEDDING_DTYPE
+    )
     logger.info("API can now run without requiring access to the original CSV file")
 
-def main(force_reload=False):
+def main(force_reload=False, batch_size=DEFAULT_INSERT_BATCH_SIZE):
     """
     Main function to set up the vector database with company embeddings.
     
     Args:
         force_reload: Whether to force reload data even if the DB already has entries
+        batch_size: Number of records to add to the vector database per call
     """
     try:
         # Set up vector DB
@@ -138,7 +173,7 @@ def main(force_reload=False):
         logger.info(f"Loaded {len(companies)} companies")
         
         # Generate embeddings and populate DB
-        populate_vector_db(collection, companies, embedding_service)
+        populate_vector_db(collection, companies, embedding_service, batch_size=batch_size)
         
         logger.info("Vector database setup complete!")
         logger.info("The API is now ready to run and will not need to access the CSV file at runtime.")
@@ -150,6 +185,12 @@ def main(force_reload=False):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Set up the vector database with company embeddings")
     parser.add_argument("--force", action="store_true", help="Force reload data even if DB already has entries")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_INSERT_BATCH_SIZE,
+        help=f"Number of records added to the vector database per batch (default: {DEFAULT_INSERT_BATCH_SIZE})"
+    )
     args = parser.parse_args()
     
-    main(force_reload=args.force) 
\ No newline at end of file
+    main(force_reload=args.force, batch_size=args.batch_size) 
\ No newline at end of file
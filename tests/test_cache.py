@@ -0,0 +1,79 @@
+from app.services import cache as cache_module
+from app.services.cache import QueryCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = QueryCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_put_existing_key_refreshes_it():
+    cache = QueryCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = QueryCache(max_size=4, ttl_seconds=10)
+    cache.put("a", 1)
+    
+    now[0] += 10
+    assert cache.get("a") == 1
+    now[0] += 0.5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_entries_never_expire_without_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = QueryCache(max_size=4, ttl_seconds=None)
+    cache.put("a", 1)
+    
+    now[0] += 1e9
+    assert cache.get("a") == 1
+
+
+def test_stats():
+    cache = QueryCache(max_size=1, ttl_seconds=None)
+    assert cache.stats()["hit_rate"] == 0.0
+    
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    cache.put("b", 2)
+    
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 1,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": 0.5,
+    }
+
+
+def test_clear_keeps_counters():
+    cache = QueryCache(max_size=4, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    
+    assert len(cache) == 0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
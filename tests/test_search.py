@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.services.search import SearchService
+from app.services.similarity import l2_normalize_rows
+
+
+@pytest.fixture
+def service():
+    # Bypass the singleton and the vector database; only the in-memory structures are set up
+    service = object.__new__(SearchService)
+    service._index = None
+    service._row_scales = None
+    return service
+
+
+def load_toy_matrix(service, sectors):
+    embeddings = l2_normalize_rows(np.random.default_rng(0).standard_normal((len(sectors), 8)))
+    service._embedding_matrix = embeddings
+    service._row_templates = [
+        {"company_name": f"Company {row}", "stock_symbol": f"S{row}", "sector": sector, "description": ""}
+        for row, sector in enumerate(sectors)
+    ]
+    service._build_sector_slices(np.array(sectors))
+    return embeddings
+
+
+def test_build_sector_slices_maps_sectors_to_row_ranges(service):
+    service._build_sector_slices(np.array(["Energy", "Energy", "Financials", "Tech", "Tech", "Tech"]))
+    
+    assert service._sector_slices == {
+        "Energy": slice(0, 2),
+        "Financials": slice(2, 3),
+        "Tech": slice(3, 6),
+    }
+
+
+def test_build_sector_slices_skips_empty_sector(service):
+    service._build_sector_slices(np.array(["", "", "Tech"]))
+    
+    assert service._sector_slices == {"Tech": slice(2, 3)}
+
+
+def test_sector_search_matches_filtered_full_scan(service):
+    sectors = ["Energy"] * 3 + ["Financials"] * 4 + ["Tech"] * 5
+    embeddings = load_toy_matrix(service, sectors)
+    queries = embeddings[[0, 5, 9]]
+    
+    results = service._search_in_memory(queries, limit=3, sector="Financials")
+    
+    for query, query_results in zip(queries, results):
+        scores = embeddings @ query
+        expected = sorted(range(3, 7), key=lambda row: -scores[row])[:3]
+        assert [result["stock_symbol"] for result in query_results] == [f"S{row}" for row in expected]
+        assert all(result["sector"] == "Financials" for result in query_results)
+        np.testing.assert_allclose([result["score"] for result in query_results], scores[expected], atol=1e-5)
+
+
+def test_unknown_sector_returns_no_results(service):
+    embeddings = load_toy_matrix(service, ["Energy", "Tech"])
+    
+    assert service._search_in_memory(embeddings, limit=5, sector="Utilities") == [[], []]
+
+
+def test_unfiltered_search_ranks_query_row_first(service):
+    embeddings = load_toy_matrix(service, ["Energy", "Energy", "Tech", "Tech"])
+    
+    results = service._search_in_memory(embeddings[[2]], limit=10, sector=None)
+    
+    assert len(results[0]) == 4
+    assert results[0][0]["stock_symbol"] == "S2"
+    assert results[0][0]["score"] == pytest.approx(1.0, abs=1e-5)
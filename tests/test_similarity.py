@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from app.services.similarity import dot_scores, l2_normalize_inplace, l2_normalize_rows, quantize_int8, top_k
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    return l2_normalize_rows(rng.standard_normal((200, 384)))
+
+
+def test_top_k_orders_highest_scores_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3], dtype=np.float32)
+    
+    assert top_k(scores, 3).tolist() == [1, 3, 2]
+
+
+def test_top_k_breaks_ties_by_index():
+    scores = np.array([0.5, 0.9, 0.5, 0.5], dtype=np.float32)
+    
+    assert top_k(scores, 4).tolist() == [1, 0, 2, 3]
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_top_k_with_non_positive_k_is_empty(k):
+    scores = np.array([0.1, 0.2], dtype=np.float32)
+    
+    assert top_k(scores, k).tolist() == []
+
+
+def test_top_k_with_k_larger_than_scores_returns_all():
+    scores = np.array([0.1, 0.3, 0.2], dtype=np.float32)
+    
+    assert top_k(scores, 10).tolist() == [1, 2, 0]
+
+
+def test_top_k_of_empty_scores_is_empty():
+    assert top_k(np.empty(0, dtype=np.float32), 5).tolist() == []
+
+
+def test_top_k_matches_full_sort():
+    scores = np.random.default_rng(1).random(1000).astype(np.float32)
+    
+    for k in (1, 5, 999, 1000):
+        assert top_k(scores, k).tolist() == np.argsort(-scores, kind="stable")[:k].tolist()
+
+
+def test_l2_normalize_rows_gives_unit_rows(matrix):
+    assert matrix.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+
+
+def test_l2_normalize_inplace_reuses_float32_input():
+    vector = np.array([3.0, 4.0], dtype=np.float32)
+    
+    normalized = l2_normalize_inplace(vector)
+    
+    assert normalized is vector
+    np.testing.assert_allclose(vector, [0.6, 0.8], rtol=1e-6)
+
+
+def test_quantize_int8_round_trips_within_one_step(matrix):
+    quantized, scales = quantize_int8(matrix)
+    
+    assert quantized.dtype == np.int8
+    assert scales.shape == (len(matrix),)
+    assert np.abs(quantized).max() == 127
+    error = np.abs(quantized * scales[:, np.newaxis] - matrix)
+    assert np.all(error <= scales[:, np.newaxis] / 2 + 1e-7)
+
+
+def test_dot_scores_float32_matches_matmul(matrix):
+    query = matrix[3]
+    
+    np.testing.assert_allclose(dot_scores(matrix, query), matrix @ query, atol=1e-5)
+
+
+def test_dot_scores_scores_query_matrix_in_one_call(matrix):
+    queries = matrix[:4]
+    
+    scores = dot_scores(matrix, queries)
+    
+    assert scores.shape == (4, len(matrix))
+    np.testing.assert_allclose(scores, queries @ matrix.T, atol=1e-5)
+    np.testing.assert_allclose(scores[2], dot_scores(matrix, queries[2]), atol=1e-6)
+
+
+def test_dot_scores_int8_approximates_float32(matrix):
+    quantized, scales = quantize_int8(matrix)
+    queries = matrix[:4]
+    
+    scores = dot_scores(quantized, queries, scales)
+    
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, queries @ matrix.T, atol=5e-3)
+    assert top_k(scores[0], 1).tolist() == [0]